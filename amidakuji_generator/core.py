@@ -1,15 +1,30 @@
 import random
-from typing import Any, Dict, List
-
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# ReportLab is imported lazily by the rendering functions so that generating
+# data, validating arguments and --help do not pay for loading it
+if TYPE_CHECKING:
+    from reportlab.pdfgen.canvas import Canvas
+
+# Shared random generator, seeded from os.urandom at import time
+_default_rng = random.Random()
 
 
 def generate_amidakuji_data(
     vertical_lines: int,
     min_horizontal_bars: int,
     max_horizontal_bars: int,
+    rng: Optional[random.Random] = None,
 ) -> Dict[str, Any]:
     """
     Generate abstract data structure for Amidakuji.
@@ -18,6 +33,9 @@ def generate_amidakuji_data(
         vertical_lines (int): Number of vertical lines (n). Must be 2 or greater.
         min_horizontal_bars (int): Minimum number of horizontal bars (b_min).
         max_horizontal_bars (int): Maximum number of horizontal bars (b_max).
+        rng (Optional[random.Random]): Random generator to draw from. Pass a
+            seeded instance for reproducible output. Defaults to a shared
+            generator seeded from the operating system.
 
     Returns:
         Dict[str, Any]: Dictionary representing Amidakuji structure.
@@ -25,6 +43,7 @@ def generate_amidakuji_data(
         {
             "vertical_lines": 5,
             "horizontal_bars_total": 10,
+            "max_y_level": 17,
             "horizontal_bars": [
                 {"y_level": 2, "left_line_index": 0},...
             ]
@@ -43,63 +62,171 @@ def generate_amidakuji_data(
     if min_horizontal_bars > max_horizontal_bars:
         raise ValueError("Minimum must be less than or equal to maximum")
 
+    if rng is None:
+        rng = _default_rng
+
     # Randomly determine total number of horizontal bars
-    total_bars = random.randint(min_horizontal_bars, max_horizontal_bars)
+    total_bars = rng.randint(min_horizontal_bars, max_horizontal_bars)
 
     # Define placement grid
     height = total_bars * 2 if total_bars > 0 else 2
     num_columns = vertical_lines - 1
 
-    # Generate placement candidates
-    positions = []
-    for y in range(height):
-        for col in range(num_columns):
-            positions.append((y, col))
+    if total_bars == 0:
+        # Nothing to place
+        horizontal_bars = []
+        max_y_level = 0
+    elif num_columns == 1:
+        # Every bar shares the only column, so the sole conflict is two bars on
+        # one level: pick distinct levels directly
+        y_levels = rng.sample(range(height), total_bars)
+        horizontal_bars = [{"y_level": y, "left_line_index": 0} for y in y_levels]
+        max_y_level = max(y_levels)
+    else:
+        horizontal_bars, max_y_level = _place_bars(total_bars, height, num_columns, rng)
+
+    return {
+        "vertical_lines": vertical_lines,
+        "horizontal_bars_total": len(horizontal_bars),
+        "max_y_level": max_y_level,
+        "horizontal_bars": horizontal_bars,
+    }
+
 
-    # Randomly shuffle
-    random.shuffle(positions)
+def _place_bars(
+    total_bars: int, height: int, num_columns: int, rng: random.Random
+) -> Tuple[List[Dict[str, int]], int]:
+    """
+    Randomly place horizontal bars so that no two bars touch on the same level.
 
-    # Manage selected positions
-    selected_positions = set()
+    Args:
+        total_bars: Number of horizontal bars to place
+        height: Number of levels in the placement grid
+        num_columns: Number of gaps between vertical lines
+        rng: Random generator to draw from
+
+    Returns:
+        Tuple[List[Dict[str, int]], int]: Placed horizontal bars and the
+            highest y_level among them (0 when none were placed)
+    """
+    # Draw placement candidates as flat cell indices (y * num_columns + col)
+    # in random order, only as many as are actually needed
+    cells = _iter_random_cells(height * num_columns, rng)
+
+    # Per-row occupancy bitsets; column col is stored at bit col + 1 so that
+    # the left/right neighbours can be tested together with a 3-bit mask
+    rows = [0] * height
     horizontal_bars = []
+    max_y_level = 0
 
     # Place horizontal bars
-    for y, col in positions:
+    for cell in cells:
         if len(horizontal_bars) >= total_bars:
             break
 
-        # Check if adjacent positions are not already selected
-        if (
-            (y, col) not in selected_positions
-            and (y, col - 1) not in selected_positions
-            and (y, col + 1) not in selected_positions
-        ):
+        y, col = divmod(cell, num_columns)
+
+        # Check if this position and its neighbours are not already selected
+        if not (rows[y] >> col) & 0b111:
             # If no conflict, add horizontal bar
             horizontal_bars.append({"y_level": y, "left_line_index": col})
-            selected_positions.add((y, col))
+            rows[y] |= 2 << col
+            if y > max_y_level:
+                max_y_level = y
+
+    return horizontal_bars, max_y_level
 
-    return {
-        "vertical_lines": vertical_lines,
-        "horizontal_bars_total": len(horizontal_bars),
-        "horizontal_bars": horizontal_bars,
-    }
 
+def _iter_random_cells(num_cells: int, rng: random.Random) -> Iterator[int]:
+    """
+    Yield each integer in range(num_cells) exactly once, in uniformly random order.
+
+    This is a lazy Fisher-Yates shuffle that only remembers swapped slots, so
+    memory grows with the number of values consumed rather than num_cells.
+
+    Args:
+        num_cells: Number of cells to permute
+        rng: Random generator to draw from
 
-def render_to_pdf(amidakuji_data: Dict[str, Any], output_path: str) -> None:
+    Yields:
+        int: Next cell index of the random permutation
+    """
+    randrange = rng.randrange
+    swapped: Dict[int, int] = {}
+    for i in range(num_cells - 1, -1, -1):
+        j = randrange(i + 1)
+        last = swapped.pop(i, i)
+        if j == i:
+            yield last
+        else:
+            cell = swapped.get(j, j)
+            swapped[j] = last
+            yield cell
+
+
+def render_to_pdf(
+    amidakuji_data: Dict[str, Any], output_path: Union[str, BinaryIO]
+) -> None:
     """
     Render Amidakuji data structure to PDF file using ReportLab.
 
     Args:
         amidakuji_data (Dict[str, Any]): Data structure obtained from
             generate_amidakuji_data.
-        output_path (str): File path to save the generated PDF.
+        output_path (Union[str, BinaryIO]): File path to save the generated
+            PDF, or a binary file-like object to write it to.
     """
-    # Create output directory if it doesn't exist
+    render_pages_to_pdf([amidakuji_data], output_path)
+
+
+def render_pages_to_pdf(
+    amidakuji_data_list: List[Dict[str, Any]], output_path: Union[str, BinaryIO]
+) -> None:
+    """
+    Render several Amidakuji into one PDF file, one Amidakuji per page.
+
+    Args:
+        amidakuji_data_list (List[Dict[str, Any]]): Data structures obtained
+            from generate_amidakuji_data.
+        output_path (Union[str, BinaryIO]): File path to save the generated
+            PDF, or a binary file-like object to write it to.
+
+    Raises:
+        ValueError: When no Amidakuji data is given
+    """
+    if not amidakuji_data_list:
+        raise ValueError("At least one Amidakuji is required")
+
     from pathlib import Path
 
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen.canvas import Canvas
+
+    # Create output directory if it doesn't exist
+    if isinstance(output_path, str):
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     # Initialize PDF document
-    c = canvas.Canvas(output_path, pagesize=A4)
+    c = Canvas(output_path, pagesize=A4)
+
+    for amidakuji_data in amidakuji_data_list:
+        _draw_page(c, amidakuji_data)
+        c.showPage()
+
+    # Save PDF
+    c.save()
+
+
+def _draw_page(c: "Canvas", amidakuji_data: Dict[str, Any]) -> None:
+    """
+    Draw one Amidakuji on the current page of the canvas.
+
+    Args:
+        c: ReportLab canvas to draw on
+        amidakuji_data: Amidakuji data structure
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+
     page_width, page_height = A4
 
     # Set margins (1 inch = 72 points)
@@ -109,10 +236,12 @@ def render_to_pdf(amidakuji_data: Dict[str, Any], output_path: str) -> None:
 
     # Get data
     n = amidakuji_data["vertical_lines"]
-    horizontal_bars = amidakuji_data["horizontal_bars"]
+    y_levels, left_indices = _bar_columns(amidakuji_data)
 
-    # Get maximum y_level to calculate layout
-    max_y_level = max([bar["y_level"] for bar in horizontal_bars], default=0)
+    # Get maximum y_level to calculate layout, tracked during generation
+    max_y_level = amidakuji_data.get("max_y_level")
+    if max_y_level is None:
+        max_y_level = max(y_levels, default=0)
     levels = max_y_level + 1
 
     # Calculate vertical line spacing
@@ -128,49 +257,67 @@ def render_to_pdf(amidakuji_data: Dict[str, Any], output_path: str) -> None:
     else:
         level_spacing = draw_height / 4
 
-    # Draw vertical lines
-    for i in range(n):
-        x = margin + i * line_spacing
-        y_top = page_height - margin - level_spacing
-        y_bottom = margin + level_spacing
-        c.line(x, y_top, x, y_bottom)
+    # Precompute x coordinate of each vertical line and y coordinate of each level
+    xs = [margin + i * line_spacing for i in range(n)]
+    y_top = page_height - margin - level_spacing
+    y_bottom = margin + level_spacing
+    level_ys = [y_top - level * level_spacing for level in range(levels)]
 
-    # Draw start labels (top)
-    for i in range(n):
-        x = margin + i * line_spacing
-        y = page_height - margin - level_spacing / 2
-        text = str(i + 1)
-        text_width = c.stringWidth(text)
-        c.drawString(x - text_width / 2, y, text)
+    # Draw vertical lines as a single path
+    c.lines([(x, y_top, x, y_bottom) for x in xs])
 
     # Simulate Amidakuji path to calculate results
-    result_mapping = _simulate_amidakuji(amidakuji_data)
+    result_mapping = _simulate_bar_columns(y_levels, left_indices, n)
 
-    # Draw end labels (bottom)
-    for i in range(n):
-        x = margin + i * line_spacing
-        y = margin + level_spacing / 2
-        result_char = chr(ord("A") + result_mapping[i])
-        text_width = c.stringWidth(result_char)
-        c.drawString(x - text_width / 2, y, result_char)
+    # Collect all labels into a single text object
+    labels = c.beginText()
 
-    # Draw horizontal bars
-    for bar in horizontal_bars:
-        y_level = bar["y_level"]
-        left_index = bar["left_line_index"]
+    # Labels share one font, so cache the width of each character once
+    char_widths: Dict[str, float] = {}
 
-        x1 = margin + left_index * line_spacing
-        x2 = margin + (left_index + 1) * line_spacing
-        y = page_height - margin - level_spacing - (y_level * level_spacing)
+    def label_width(text: str) -> float:
+        width = 0.0
+        for char in text:
+            if char not in char_widths:
+                char_widths[char] = c.stringWidth(char)
+            width += char_widths[char]
+        return width
 
-        c.line(x1, y, x2, y)
+    # Draw start labels (top)
+    y = page_height - margin - level_spacing / 2
+    for i, x in enumerate(xs):
+        text = str(i + 1)
+        text_width = label_width(text)
+        labels.setTextOrigin(x - text_width / 2, y)
+        labels.textOut(text)
 
-    # Display generation parameters in footer
-    footer_text = f"Generated with n={n}, bars={len(horizontal_bars)}"
-    c.drawString(margin, margin / 2, footer_text)
+    # Draw end labels (bottom)
+    y = margin + level_spacing / 2
+    for x, result_index in zip(xs, result_mapping, strict=True):
+        result_char = chr(ord("A") + result_index)
+        text_width = label_width(result_char)
+        labels.setTextOrigin(x - text_width / 2, y)
+        labels.textOut(result_char)
 
-    # Save PDF
-    c.save()
+    # Display generation parameters in footer
+    footer_text = f"Generated with n={n}, bars={len(y_levels)}"
+    labels.setTextOrigin(margin, margin / 2)
+    labels.textOut(footer_text)
+
+    c.drawText(labels)
+
+    # Draw horizontal bars as a single path
+    bar_lines = [
+        (
+            xs[left_index],
+            level_ys[y_level],
+            xs[left_index] + line_spacing,
+            level_ys[y_level],
+        )
+        for y_level, left_index in zip(y_levels, left_indices, strict=True)
+    ]
+    if bar_lines:
+        c.lines(bar_lines)
 
 
 def _simulate_amidakuji(amidakuji_data: Dict[str, Any]) -> List[int]:
@@ -183,22 +330,70 @@ def _simulate_amidakuji(amidakuji_data: Dict[str, Any]) -> List[int]:
     Returns:
         List[int]: Index of destination point corresponding to each starting point
     """
-    n = amidakuji_data["vertical_lines"]
+    y_levels, left_indices = _bar_columns(amidakuji_data)
+    return _simulate_bar_columns(
+        y_levels, left_indices, amidakuji_data["vertical_lines"]
+    )
+
+
+def _bar_columns(amidakuji_data: Dict[str, Any]) -> Tuple[List[int], List[int]]:
+    """
+    Unpack horizontal bars into parallel lists of y levels and left line indices.
+
+    Args:
+        amidakuji_data: Amidakuji data structure
+
+    Returns:
+        Tuple[List[int], List[int]]: y_level and left_line_index of each bar
+    """
     horizontal_bars = amidakuji_data["horizontal_bars"]
+    y_levels = [bar["y_level"] for bar in horizontal_bars]
+    left_indices = [bar["left_line_index"] for bar in horizontal_bars]
+    return y_levels, left_indices
+
+
+def _simulate_bar_columns(
+    y_levels: List[int], left_indices: List[int], n: int
+) -> List[int]:
+    """
+    Simulate Amidakuji path from bars given as parallel lists.
+
+    Args:
+        y_levels: y_level of each horizontal bar
+        left_indices: left_line_index of each horizontal bar
+        n: Number of vertical lines
+
+    Returns:
+        List[int]: Index of destination point corresponding to each starting point
+    """
+    # Sort by y_level and process from top to bottom; using the list's own
+    # __getitem__ as key keeps key extraction out of Python-level code
+    order = sorted(range(len(y_levels)), key=y_levels.__getitem__)
+
+    return _apply_swaps([left_indices[i] for i in order], n)
 
-    # Sort by y_level and process from top to bottom
-    sorted_bars = sorted(horizontal_bars, key=lambda x: x["y_level"])
 
+def _apply_swaps(left_indices: List[int], n: int) -> List[int]:
+    """
+    Apply horizontal bar swaps in order to the positions of n vertical lines.
+
+    Args:
+        left_indices: Left line index of each horizontal bar, top to bottom
+        n: Number of vertical lines
+
+    Returns:
+        List[int]: Index of destination point corresponding to each starting point
+    """
     # Track current position of each line
     positions = list(range(n))
-
-    # Execute swaps by horizontal bars at each level
-    for bar in sorted_bars:
-        left_index = bar["left_line_index"]
-        # Swap positions at left_index and left_index+1
-        if left_index < len(positions) - 1:
-            positions[left_index], positions[left_index + 1] = (
-                positions[left_index + 1],
+    last_index = n - 1
+
+    # Swap positions at left_index and left_index+1 for each bar
+    for left_index in left_indices:
+        if left_index < last_index:
+            right_index = left_index + 1
+            positions[left_index], positions[right_index] = (
+                positions[right_index],
                 positions[left_index],
             )
 
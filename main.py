@@ -9,7 +9,7 @@ import argparse
 import sys
 from pathlib import Path
 
-from amidakuji_generator.core import generate_amidakuji_data, render_to_pdf
+from amidakuji_generator.core import generate_amidakuji_data, render_pages_to_pdf
 
 
 def main() -> None:
@@ -44,9 +44,20 @@ def main() -> None:
         "--output", "-o", type=str, required=True, help="Path to output PDF file"
     )
 
+    parser.add_argument(
+        "--count",
+        "-c",
+        type=int,
+        default=1,
+        help="Number of Amidakuji to generate, one per page (integer >= 1)",
+    )
+
     args = parser.parse_args()
 
     try:
+        if args.count < 1:
+            raise ValueError("Count must be 1 or greater")
+
         # Create output directory if it doesn't exist
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -56,22 +67,28 @@ def main() -> None:
             f"Generating Amidakuji... (lines: {args.lines}, "
             f"bars: {args.min_bars}-{args.max_bars})"
         )
-        amidakuji_data = generate_amidakuji_data(
-            vertical_lines=args.lines,
-            min_horizontal_bars=args.min_bars,
-            max_horizontal_bars=args.max_bars,
-        )
-
-        # Render to PDF
+        amidakuji_data_list = [
+            generate_amidakuji_data(
+                vertical_lines=args.lines,
+                min_horizontal_bars=args.min_bars,
+                max_horizontal_bars=args.max_bars,
+            )
+            for _ in range(args.count)
+        ]
+
+        # Render to PDF, one page per Amidakuji
         print(f"Generating PDF... (output: {args.output})")
-        render_to_pdf(amidakuji_data, args.output)
+        render_pages_to_pdf(amidakuji_data_list, args.output)
 
         # Display results
-        bars_count = amidakuji_data["horizontal_bars_total"]
-        print(
-            f"Complete! Saved Amidakuji with {bars_count} "
-            f"horizontal bars to {args.output}."
-        )
+        if args.count == 1:
+            bars_count = amidakuji_data_list[0]["horizontal_bars_total"]
+            print(
+                f"Complete! Saved Amidakuji with {bars_count} "
+                f"horizontal bars to {args.output}."
+            )
+        else:
+            print(f"Complete! Saved {args.count} Amidakuji to {args.output}.")
 
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -3,140 +3,115 @@
 Apply EditorConfig settings to existing files
 """
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Whitespace at the end of each line (a stray CR before LF counts too)
+TRAILING_WHITESPACE_PATTERN = re.compile(rb"[ \t\r\f\v]+$", re.MULTILINE)
 
-def fix_line_endings(file_path: Path) -> bool:
+
+def fix_line_endings(content: bytes) -> bytes:
     """Fix line endings to LF"""
-    try:
-        with open(file_path, "rb") as f:
-            content = f.read()
-
-        # Convert CRLF to LF
-        if b"\r\n" in content:
-            content = content.replace(b"\r\n", b"\n")
-            with open(file_path, "wb") as f:
-                f.write(content)
-            return True
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-    return False
+    return content.replace(b"\r\n", b"\n")
 
 
-def ensure_final_newline(file_path: Path) -> bool:
-    """Ensure file ends with newline"""
-    try:
-        with open(file_path, "rb") as f:
-            content = f.read()
-
-        if content and not content.endswith(b"\n"):
-            content += b"\n"
-            with open(file_path, "wb") as f:
-                f.write(content)
-            return True
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-    return False
+def ensure_final_newline(content: bytes) -> bytes:
+    """Ensure content ends with newline"""
+    if content and not content.endswith(b"\n"):
+        return content + b"\n"
+    return content
 
 
-def trim_trailing_whitespace(file_path: Path) -> bool:
+def trim_trailing_whitespace(content: bytes) -> bytes:
     """Remove trailing whitespace from lines"""
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        modified = False
-        new_lines = []
-        for line in lines:
-            new_line = line.rstrip() + "\n" if line.endswith("\n") else line.rstrip()
-            if new_line != line:
-                modified = True
-            new_lines.append(new_line)
-
-        if modified:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.writelines(new_lines)
-
-        return modified
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-    return False
+    return TRAILING_WHITESPACE_PATTERN.sub(b"", content)
 
 
-def apply_editorconfig_to_file(file_path: Path) -> None:
-    """Apply EditorConfig settings to a single file"""
-    print(f"Processing: {file_path}")
+def apply_editorconfig_to_file(file_path: Path) -> str:
+    """Apply EditorConfig settings to a single file and return a report line"""
+    try:
+        original = file_path.read_bytes()
+    except Exception as e:
+        return f"Error processing {file_path}: {e}"
 
+    content = original
     changes = []
 
     # Fix line endings
-    if fix_line_endings(file_path):
+    fixed = fix_line_endings(content)
+    if fixed != content:
         changes.append("line endings")
+        content = fixed
 
     # Trim trailing whitespace (except .md files)
     if file_path.suffix != ".md":
-        if trim_trailing_whitespace(file_path):
+        fixed = trim_trailing_whitespace(content)
+        if fixed != content:
             changes.append("trailing whitespace")
+            content = fixed
 
     # Ensure final newline
-    if ensure_final_newline(file_path):
+    fixed = ensure_final_newline(content)
+    if fixed != content:
         changes.append("final newline")
+        content = fixed
 
-    if changes:
-        print(f"  ✓ Fixed: {', '.join(changes)}")
-    else:
-        print("  ✓ No changes needed")
+    if not changes:
+        return "  ✓ No changes needed"
+
+    # Write all fixes back at once
+    try:
+        file_path.write_bytes(content)
+    except Exception as e:
+        return f"Error processing {file_path}: {e}"
+
+    return f"  ✓ Fixed: {', '.join(changes)}"
 
 
 def main() -> None:
     """Main function"""
     project_root = Path(__file__).parent.parent
 
-    # File patterns to process
-    patterns = [
-        "**/*.py",
-        "**/*.json",
-        "**/*.yml",
-        "**/*.yaml",
-        "**/*.toml",
-        "**/*.md",
-        "**/*.sh",
-        ".gitignore",
-        ".editorconfig",
-    ]
-
-    # Exclude patterns
-    exclude_patterns = [
-        "**/.*/**",  # Hidden directories
-        "**/__pycache__/**",
-        "**/.venv/**",
-        "**/.git/**",
-        "**/node_modules/**",
-    ]
+    # File extensions to process at any depth
+    extensions = (".py", ".json", ".yml", ".yaml", ".toml", ".md", ".sh")
+
+    # File names to process in the project root only
+    root_files = {".gitignore", ".editorconfig"}
+
+    # Directories never descended into (hidden directories are skipped too)
+    exclude_dirs = {"__pycache__", ".venv", ".git", "node_modules"}
 
     print("Applying EditorConfig settings to existing files...")
     print(f"Project root: {project_root}")
     print()
 
-    processed_files = 0
-
-    for pattern in patterns:
-        for file_path in project_root.glob(pattern):
-            # Skip if matches exclude pattern
-            should_exclude = False
-            for exclude in exclude_patterns:
-                if file_path.match(exclude):
-                    should_exclude = True
-                    break
-
-            if should_exclude or not file_path.is_file():
-                continue
-
-            apply_editorconfig_to_file(file_path)
-            processed_files += 1
+    file_paths = []
+
+    # Walk the tree once, pruning excluded directories in place so that their
+    # contents are never listed
+    for root, dirs, files in os.walk(project_root):
+        dirs[:] = sorted(
+            d for d in dirs if not d.startswith(".") and d not in exclude_dirs
+        )
+        root_path = Path(root)
+        at_project_root = root_path == project_root
+        for name in sorted(files):
+            if name.endswith(extensions) or (at_project_root and name in root_files):
+                file_paths.append(root_path / name)
+
+    # Files are independent and the work is mostly I/O, so process them in
+    # parallel; map() keeps the report in the original file order
+    max_workers = (os.cpu_count() or 1) * 4
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        reports = executor.map(apply_editorconfig_to_file, file_paths)
+        for file_path, report in zip(file_paths, reports, strict=True):
+            print(f"Processing: {file_path}")
+            print(report)
 
     print()
-    print(f"Processed {processed_files} files")
+    print(f"Processed {len(file_paths)} files")
     print("✓ EditorConfig settings applied!")
 
 
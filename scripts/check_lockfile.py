@@ -3,25 +3,224 @@
 Check if uv.lock is consistent with pyproject.toml
 """
 
+import json
+import os
+import re
+import shutil
 import subprocess
 import sys
+import tomllib
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).parent.parent
 
-def run_command(cmd: list[str], cwd: Path | None = None) -> tuple[int, str, str]:
-    """Run a command and return exit code, stdout, stderr"""
+# Requirement with an optional version specifier, but no extras, markers or URL
+SIMPLE_REQUIREMENT_PATTERN = re.compile(
+    r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*([<>=!~][^;@\[]*)?$"
+)
+
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "amidakuji"
+)
+
+# Cached results of the uv capability probe, keyed by uv binary
+UV_CAPS_CACHE = CACHE_DIR / "uv_caps.json"
+
+# Signature of the inputs at the last successful check, keyed by project root
+LOCK_CHECK_CACHE = CACHE_DIR / "lock_check.json"
+
+
+def run_command(cmd: list[str], cwd: Path | None = None) -> tuple[int, bytes, bytes]:
+    """Run a command and return exit code, stdout, stderr as raw bytes"""
+    # Output is captured, so keep uv from drawing progress bars or colors, and
+    # never let it wait on the terminal for input
+    env = {**os.environ, "UV_NO_PROGRESS": "1", "NO_COLOR": "1"}
     result = subprocess.run(
         cmd,
         cwd=cwd,
+        stdin=subprocess.DEVNULL,
         capture_output=True,
-        text=True,
+        env=env,
     )
     return result.returncode, result.stdout, result.stderr
 
 
-def main() -> None:
+def load_cache(cache_file: Path) -> dict:
+    """Load a JSON cache file, treating a missing or corrupt file as empty"""
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(cache_file: Path, cache: dict) -> None:
+    """Write a JSON cache file, ignoring errors since the cache is optional"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        pass
+
+
+def file_signature(path: Path) -> str:
+    """Identify a file by its resolved path, size and mtime"""
+    resolved = path.resolve()
+    stat = resolved.stat()
+    return f"{resolved}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def uv_binary_signature() -> str | None:
+    """Return the signature of the uv binary on PATH, or None if not found"""
+    uv_path = shutil.which("uv")
+    return None if uv_path is None else file_signature(Path(uv_path))
+
+
+def uv_supports_check(cwd: Path) -> bool:
+    """
+    Check whether 'uv lock' supports --check.
+
+    The answer is cached per uv binary (path, size and mtime), so the
+    'uv lock --help' probe only runs again after uv is installed or updated.
+    """
+    cache_key = uv_binary_signature()
+    cache = load_cache(UV_CAPS_CACHE)
+
+    if cache_key in cache:
+        return bool(cache[cache_key])
+
+    help_code, help_stdout, _ = run_command(["uv", "lock", "--help"], cwd=cwd)
+    supported = help_code == 0 and b"--check" in help_stdout
+
+    # Only remember definite answers; a failed probe is retried next time
+    if cache_key is not None and help_code == 0:
+        cache[cache_key] = supported
+        save_cache(UV_CAPS_CACHE, cache)
+
+    return supported
+
+
+def lock_inputs_signature(project_root: Path) -> str | None:
+    """
+    Describe everything the consistency check depends on.
+
+    Combines the signatures of pyproject.toml, uv.lock and the uv binary.
+    Returns None when any of them is missing, so the result is never cached.
+    """
+    uv_signature = uv_binary_signature()
+    if uv_signature is None:
+        return None
+    try:
+        files = [
+            file_signature(project_root / name)
+            for name in ("pyproject.toml", "uv.lock")
+        ]
+    except OSError:
+        return None
+    return "|".join([*files, uv_signature])
+
+
+def lock_check_is_cached(project_root: Path) -> bool:
+    """Check whether the inputs are unchanged since the last successful check"""
+    signature = lock_inputs_signature(project_root)
+    cache = load_cache(LOCK_CHECK_CACHE)
+    return signature is not None and cache.get(str(project_root.resolve())) == signature
+
+
+def record_lock_check(project_root: Path) -> None:
+    """Remember the current inputs after a successful check"""
+    signature = lock_inputs_signature(project_root)
+    if signature is None:
+        return
+    cache = load_cache(LOCK_CHECK_CACHE)
+    cache[str(project_root.resolve())] = signature
+    save_cache(LOCK_CHECK_CACHE, cache)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a package name as described in PEP 503"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def declared_requirements(pyproject: dict) -> set[tuple] | None:
+    """
+    Collect (name, specifier, marker) for every requirement in pyproject.toml.
+
+    Returns None when a requirement or setting is too complex to compare
+    against uv.lock statically.
+    """
+    project = pyproject.get("project", {})
+    if "dependency-groups" in pyproject or "uv" in pyproject.get("tool", {}):
+        return None
+
+    entries = [(req, None) for req in project.get("dependencies", [])]
+    for extra, reqs in project.get("optional-dependencies", {}).items():
+        entries += [(req, f"extra == '{extra}'") for req in reqs]
+
+    requirements = set()
+    for req, marker in entries:
+        match = SIMPLE_REQUIREMENT_PATTERN.match(req.strip())
+        if match is None:
+            return None
+        name, specifier = match.groups()
+        if specifier is not None:
+            specifier = re.sub(r"\s+", "", specifier)
+        requirements.add((normalize_name(name), specifier, marker))
+    return requirements
+
+
+def lock_metadata_matches(pyproject_file: Path, lock_file: Path) -> bool:
+    """
+    Check pyproject.toml against the project metadata recorded in uv.lock.
+
+    Returns True only when the version, requires-python, the extras and every
+    requirement match exactly. Anything else, including metadata this check cannot
+    interpret, returns False so that the caller falls back to regenerating.
+    """
+    try:
+        with open(pyproject_file, "rb") as f:
+            pyproject = tomllib.load(f)
+        with open(lock_file, "rb") as f:
+            lock = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return False
+
+    project = pyproject.get("project", {})
+    requirements = declared_requirements(pyproject)
+    # A dynamic version or dependencies are only known after a build
+    if requirements is None or "name" not in project or "dynamic" in project:
+        return False
+
+    project_name = normalize_name(project["name"])
+    packages = [
+        package
+        for package in lock.get("package", [])
+        if package.get("name") == project_name
+    ]
+    if len(packages) != 1:
+        return False
+    metadata = packages[0].get("metadata", {})
+
+    locked_requirements = {
+        (
+            normalize_name(req.get("name", "")),
+            req.get("specifier"),
+            req.get("marker"),
+        )
+        for req in metadata.get("requires-dist", [])
+    }
+
+    return (
+        packages[0].get("version") == project.get("version")
+        and lock.get("requires-python") == project.get("requires-python")
+        and sorted(metadata.get("provides-extras", []))
+        == sorted(project.get("optional-dependencies", {}))
+        and locked_requirements == requirements
+    )
+
+
+def main(project_root: Path = PROJECT_ROOT) -> None:
     """Main function to check lock file consistency"""
-    project_root = Path(__file__).parent.parent
 
     print("🔍 Checking uv.lock consistency with pyproject.toml...")
 
@@ -32,12 +231,15 @@ def main() -> None:
         print("💡 Run 'uv lock' to generate it")
         sys.exit(1)
 
-    # Check if --check flag is supported by running uv lock --help
-    help_code, help_stdout, help_stderr = run_command(
-        ["uv", "lock", "--help"], cwd=project_root
-    )
+    # Nothing to do if neither the inputs nor uv changed since the last pass.
+    # File stats are compared for equality rather than ordering, because a
+    # checkout gives files arbitrary mtimes.
+    if lock_check_is_cached(project_root):
+        print("✅ uv.lock is unchanged since the last successful check")
+        return
 
-    if help_code == 0 and "--check" in help_stdout:
+    # Check if --check flag is supported (probe result is cached per uv binary)
+    if uv_supports_check(project_root):
         # Use --check if available (newer uv versions)
         print("🔍 Using uv lock --check...")
         exit_code, stdout, stderr = run_command(
@@ -46,13 +248,14 @@ def main() -> None:
 
         if exit_code == 0:
             print("✅ uv.lock is consistent with pyproject.toml")
+            record_lock_check(project_root)
         else:
             print("❌ uv.lock is outdated or inconsistent!")
             print("\n📋 uv output:")
             if stdout:
-                print(stdout)
+                print(stdout.decode("utf-8", errors="replace"))
             if stderr:
-                print(stderr)
+                print(stderr.decode("utf-8", errors="replace"))
             print("\n💡 To fix this issue:")
             print("   1. Run 'uv lock' to update uv.lock")
             print("   2. Commit the updated uv.lock file")
@@ -61,11 +264,15 @@ def main() -> None:
         # Fallback method for older uv versions
         print("🔄 Using fallback method (older uv version)...")
 
-        # Create a backup of current lock file
-        import shutil
+        # Regenerating is expensive, so first compare the recorded metadata
+        if lock_metadata_matches(project_root / "pyproject.toml", lock_file):
+            print("✅ uv.lock metadata matches pyproject.toml")
+            record_lock_check(project_root)
+            return
 
-        backup_path = lock_file.with_suffix(".lock.backup")
-        shutil.copy2(lock_file, backup_path)
+        # Keep the current lock file in memory so it can be restored
+        original = lock_file.read_bytes()
+        consistent = False
 
         try:
             # Generate new lock file
@@ -74,29 +281,25 @@ def main() -> None:
             if exit_code != 0:
                 print("❌ Failed to regenerate lock file!")
                 if stderr:
-                    print(stderr)
+                    print(stderr.decode("utf-8", errors="replace"))
                 sys.exit(1)
 
             # Compare old and new lock files
-            with open(lock_file, "r") as f:
-                new_content = f.read()
-            with open(backup_path, "r") as f:
-                old_content = f.read()
-
-            if new_content == old_content:
-                print("✅ uv.lock is consistent with pyproject.toml")
-            else:
-                print("❌ uv.lock is outdated or inconsistent!")
-                print("\n💡 To fix this issue:")
-                print("   1. Run 'uv lock' to update uv.lock")
-                print("   2. Commit the updated uv.lock file")
-                # Restore original lock file
-                shutil.move(backup_path, lock_file)
-                sys.exit(1)
+            consistent = lock_file.read_bytes() == original
         finally:
-            # Clean up backup file if it exists
-            if backup_path.exists():
-                backup_path.unlink()
+            # Restore original lock file unless uv left it unchanged
+            if not consistent:
+                lock_file.write_bytes(original)
+
+        if consistent:
+            print("✅ uv.lock is consistent with pyproject.toml")
+            record_lock_check(project_root)
+        else:
+            print("❌ uv.lock is outdated or inconsistent!")
+            print("\n💡 To fix this issue:")
+            print("   1. Run 'uv lock' to update uv.lock")
+            print("   2. Commit the updated uv.lock file")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,287 @@
+"""
+Tests for scripts/check_lockfile.py
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "check_lockfile.py"
+
+PYPROJECT = """\
+[project]
+name = "Example_Project"
+version = "0.1.0"
+requires-python = ">=3.12"
+dependencies = [
+    "reportlab",
+    "requests >= 2.0",
+]
+
+[project.optional-dependencies]
+dev = [
+    "pytest",
+]
+"""
+
+LOCK = """\
+version = 1
+requires-python = ">=3.12"
+
+[[package]]
+name = "example-project"
+version = "0.1.0"
+source = { editable = "." }
+
+[package.optional-dependencies]
+dev = [
+    { name = "pytest" },
+]
+
+[package.metadata]
+requires-dist = [
+    { name = "pytest", marker = "extra == 'dev'" },
+    { name = "reportlab" },
+    { name = "requests", specifier = ">=2.0" },
+]
+provides-extras = ["dev"]
+"""
+
+
+def load_script() -> ModuleType:
+    """Import check_lockfile.py, which lives outside any package"""
+    spec = importlib.util.spec_from_file_location("check_lockfile", SCRIPT_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+check_lockfile = load_script()
+
+
+class TestLockMetadataMatches:
+    """Test class for lock_metadata_matches function"""
+
+    def check(self, tmp_path: Path, pyproject: str, lock: str = LOCK) -> bool:
+        """Write both files and compare them"""
+        pyproject_file = tmp_path / "pyproject.toml"
+        lock_file = tmp_path / "uv.lock"
+        pyproject_file.write_text(pyproject)
+        lock_file.write_text(lock)
+        return check_lockfile.lock_metadata_matches(pyproject_file, lock_file)
+
+    def test_matching_metadata(self, tmp_path: Path) -> None:
+        """Test that unchanged metadata matches"""
+        assert self.check(tmp_path, PYPROJECT)
+
+    def test_repository_lockfile(self) -> None:
+        """Test that the repository's own uv.lock matches its pyproject.toml"""
+        root = SCRIPT_PATH.parent.parent
+        assert check_lockfile.lock_metadata_matches(
+            root / "pyproject.toml", root / "uv.lock"
+        )
+
+    def test_added_dependency(self, tmp_path: Path) -> None:
+        """Test that a dependency missing from uv.lock is detected"""
+        pyproject = PYPROJECT.replace(
+            '    "reportlab",\n', '    "reportlab",\n    "rich",\n'
+        )
+        assert not self.check(tmp_path, pyproject)
+
+    def test_changed_specifier(self, tmp_path: Path) -> None:
+        """Test that a changed version specifier is detected"""
+        pyproject = PYPROJECT.replace("requests >= 2.0", "requests>=2.1")
+        assert not self.check(tmp_path, pyproject)
+
+    def test_version_bump(self, tmp_path: Path) -> None:
+        """Test that a project version change is detected"""
+        pyproject = PYPROJECT.replace('version = "0.1.0"', 'version = "0.2.0"')
+        assert not self.check(tmp_path, pyproject)
+
+    def test_dynamic_metadata(self, tmp_path: Path) -> None:
+        """Test that dynamic project metadata is never trusted"""
+        pyproject = PYPROJECT.replace(
+            'version = "0.1.0"', 'version = "0.1.0"\ndynamic = ["readme"]'
+        )
+        assert not self.check(tmp_path, pyproject)
+
+    @pytest.mark.parametrize(
+        "extra_section",
+        [
+            '[tool.uv]\ndev-dependencies = ["ruff"]\n',
+            '[dependency-groups]\nlint = ["ruff"]\n',
+        ],
+    )
+    def test_unsupported_settings(self, tmp_path: Path, extra_section: str) -> None:
+        """Test that settings the static check cannot compare bail out"""
+        assert not self.check(tmp_path, PYPROJECT + "\n" + extra_section)
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Project with pyproject.toml and uv.lock, and a private check cache"""
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "pyproject.toml").write_text(PYPROJECT)
+    (root / "uv.lock").write_text(LOCK)
+    monkeypatch.setattr(check_lockfile, "LOCK_CHECK_CACHE", tmp_path / "cache.json")
+    monkeypatch.setattr(check_lockfile, "uv_binary_signature", lambda: "uv:1:1")
+    return root
+
+
+class TestLockCheckCache:
+    """Test class for lock_check_is_cached and record_lock_check functions"""
+
+    def test_hit_after_recorded_pass(self, project: Path) -> None:
+        """Test that unchanged inputs hit the cache after a recorded pass"""
+        assert not check_lockfile.lock_check_is_cached(project)
+
+        check_lockfile.record_lock_check(project)
+
+        assert check_lockfile.lock_check_is_cached(project)
+
+    @pytest.mark.parametrize("name", ["pyproject.toml", "uv.lock"])
+    def test_miss_after_size_change(self, project: Path, name: str) -> None:
+        """Test that a file whose size changed misses the cache"""
+        check_lockfile.record_lock_check(project)
+        path = project / name
+        stat = path.stat()
+        path.write_text(path.read_text() + "\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert not check_lockfile.lock_check_is_cached(project)
+
+    @pytest.mark.parametrize("name", ["pyproject.toml", "uv.lock"])
+    def test_miss_after_mtime_change(self, project: Path, name: str) -> None:
+        """Test that a file with the same size but a new mtime misses the cache"""
+        check_lockfile.record_lock_check(project)
+        path = project / name
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert not check_lockfile.lock_check_is_cached(project)
+
+    def test_miss_after_uv_change(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that installing another uv binary misses the cache"""
+        check_lockfile.record_lock_check(project)
+        monkeypatch.setattr(check_lockfile, "uv_binary_signature", lambda: "uv:2:2")
+
+        assert not check_lockfile.lock_check_is_cached(project)
+
+    def test_miss_without_uv(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that nothing is cached or recorded when uv is not found"""
+        check_lockfile.record_lock_check(project)
+        monkeypatch.setattr(check_lockfile, "uv_binary_signature", lambda: None)
+
+        assert not check_lockfile.lock_check_is_cached(project)
+
+        check_lockfile.LOCK_CHECK_CACHE.unlink()
+        check_lockfile.record_lock_check(project)
+        assert not check_lockfile.LOCK_CHECK_CACHE.exists()
+
+    @pytest.mark.parametrize("content", ["{not json", "[1, 2]", '"text"'])
+    def test_invalid_cache_file(self, project: Path, content: str) -> None:
+        """Test that a corrupt or non-dict cache file is treated as empty"""
+        check_lockfile.LOCK_CHECK_CACHE.write_text(content)
+
+        assert not check_lockfile.lock_check_is_cached(project)
+
+        check_lockfile.record_lock_check(project)
+        assert check_lockfile.lock_check_is_cached(project)
+
+
+class TestFallbackRestore:
+    """Test class for the uv.lock snapshot in the fallback check"""
+
+    @pytest.fixture(autouse=True)
+    def fallback(self, project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Force the regenerate-and-compare path"""
+        monkeypatch.setattr(check_lockfile, "uv_supports_check", lambda cwd: False)
+        monkeypatch.setattr(
+            check_lockfile, "lock_metadata_matches", lambda pyproject, lock: False
+        )
+
+    def fake_uv_lock(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        project: Path,
+        content: bytes | None,
+        exit_code: int = 0,
+    ) -> None:
+        """Replace 'uv lock' with a stub that optionally rewrites uv.lock"""
+
+        def run_command(
+            cmd: list[str], cwd: Path | None = None
+        ) -> tuple[int, bytes, bytes]:
+            if content is not None:
+                (project / "uv.lock").write_bytes(content)
+            return exit_code, b"", b"error: resolution failed"
+
+        monkeypatch.setattr(check_lockfile, "run_command", run_command)
+
+    def test_restore_after_rewrite(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a rewritten uv.lock is restored and the check fails"""
+        original = (project / "uv.lock").read_bytes()
+        self.fake_uv_lock(monkeypatch, project, original + b"# changed\n")
+
+        with pytest.raises(SystemExit) as exc_info:
+            check_lockfile.main(project)
+
+        assert exc_info.value.code == 1
+        assert (project / "uv.lock").read_bytes() == original
+
+    def test_restore_after_failure(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that uv.lock is restored when 'uv lock' corrupts it and fails"""
+        original = (project / "uv.lock").read_bytes()
+        self.fake_uv_lock(monkeypatch, project, b"\x00garbage", exit_code=2)
+
+        with pytest.raises(SystemExit) as exc_info:
+            check_lockfile.main(project)
+
+        assert exc_info.value.code == 1
+        assert (project / "uv.lock").read_bytes() == original
+
+    def test_restore_after_exception(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that uv.lock is restored when running 'uv lock' raises"""
+        original = (project / "uv.lock").read_bytes()
+
+        def run_command(
+            cmd: list[str], cwd: Path | None = None
+        ) -> tuple[int, bytes, bytes]:
+            (project / "uv.lock").write_bytes(b"")
+            raise FileNotFoundError("uv")
+
+        monkeypatch.setattr(check_lockfile, "run_command", run_command)
+
+        with pytest.raises(FileNotFoundError):
+            check_lockfile.main(project)
+
+        assert (project / "uv.lock").read_bytes() == original
+
+    def test_unchanged_lock_is_not_written(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an unchanged uv.lock passes without being written"""
+        lock_file = project / "uv.lock"
+        os.utime(lock_file, ns=(0, 1_000_000_000))
+        self.fake_uv_lock(monkeypatch, project, None)
+
+        check_lockfile.main(project)
+
+        assert lock_file.read_text() == LOCK
+        assert lock_file.stat().st_mtime_ns == 1_000_000_000
+        assert not list(project.glob("uv.lock.*"))
@@ -2,12 +2,46 @@
 Tests for amidakuji_generator.core module
 """
 
+import io
+import random
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
+from typing import Any, Dict
 
 import pytest
 
-from amidakuji_generator.core import generate_amidakuji_data, render_to_pdf
+from amidakuji_generator.core import (
+    _simulate_amidakuji,
+    generate_amidakuji_data,
+    render_pages_to_pdf,
+    render_to_pdf,
+)
+
+# Expected error messages, shared by the error handling tests
+ERR_VERTICAL_LINES = r"Number of vertical lines must be 2 or greater"
+ERR_RANGE = r"Minimum must be less than or equal to maximum"
+ERR_NEGATIVE_MIN = r"Minimum number of horizontal bars must be 0 or greater"
+ERR_NO_PAGES = r"At least one Amidakuji is required"
+
+
+class TestModuleImport:
+    """Test class for importing amidakuji_generator.core"""
+
+    def test_import_does_not_load_reportlab(self) -> None:
+        """Test that importing and generating data defer loading ReportLab"""
+        code = (
+            "import sys\n"
+            "from amidakuji_generator import core\n"
+            "core.generate_amidakuji_data(5, 3, 10)\n"
+            "sys.exit('reportlab' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent.parent
+        )
+
+        assert result.returncode == 0
 
 
 class TestGenerateAmidakujiData:
@@ -29,6 +63,29 @@ class TestGenerateAmidakujiData:
         assert 3 <= result["horizontal_bars_total"] <= 10
         assert len(result["horizontal_bars"]) == result["horizontal_bars_total"]
 
+    def test_seeded_rng_is_reproducible(self) -> None:
+        """Test that the same seeded generator yields the same Amidakuji"""
+        results = [
+            generate_amidakuji_data(
+                vertical_lines=6,
+                min_horizontal_bars=5,
+                max_horizontal_bars=15,
+                rng=random.Random(42),
+            )
+            for _ in range(2)
+        ]
+
+        assert results[0] == results[1]
+
+    def test_max_y_level(self) -> None:
+        """Test that max_y_level matches the highest bar level"""
+        result = generate_amidakuji_data(
+            vertical_lines=5, min_horizontal_bars=3, max_horizontal_bars=10
+        )
+
+        expected = max(bar["y_level"] for bar in result["horizontal_bars"])
+        assert result["max_y_level"] == expected
+
     def test_horizontal_bars_structure(self) -> None:
         """Test horizontal bars data structure"""
         result = generate_amidakuji_data(
@@ -43,30 +100,48 @@ class TestGenerateAmidakujiData:
             assert isinstance(bar["left_line_index"], int)
             assert 0 <= bar["left_line_index"] < result["vertical_lines"] - 1
 
+    def test_no_adjacent_bars_on_same_level(self) -> None:
+        """Test that bars on the same level never share a vertical line"""
+        result = generate_amidakuji_data(
+            vertical_lines=6, min_horizontal_bars=30, max_horizontal_bars=30
+        )
+
+        positions = {
+            (bar["y_level"], bar["left_line_index"])
+            for bar in result["horizontal_bars"]
+        }
+        assert len(positions) == result["horizontal_bars_total"]
+        for y, col in positions:
+            assert (y, col + 1) not in positions
+
+    def test_two_vertical_lines(self) -> None:
+        """Test that every bar is placed on its own level with two lines"""
+        result = generate_amidakuji_data(
+            vertical_lines=2, min_horizontal_bars=12, max_horizontal_bars=12
+        )
+
+        assert result["horizontal_bars_total"] == 12
+        y_levels = [bar["y_level"] for bar in result["horizontal_bars"]]
+        assert len(set(y_levels)) == 12
+        assert all(bar["left_line_index"] == 0 for bar in result["horizontal_bars"])
+
     def test_invalid_vertical_lines(self) -> None:
         """Test error handling for invalid number of vertical lines"""
-        with pytest.raises(
-            ValueError, match="Number of vertical lines must be 2 or greater"
-        ):
+        with pytest.raises(ValueError, match=ERR_VERTICAL_LINES):
             generate_amidakuji_data(
                 vertical_lines=1, min_horizontal_bars=0, max_horizontal_bars=5
             )
 
     def test_invalid_horizontal_bars_range(self) -> None:
         """Test error handling for invalid horizontal bars range"""
-        with pytest.raises(
-            ValueError, match="Minimum must be less than or equal to maximum"
-        ):
+        with pytest.raises(ValueError, match=ERR_RANGE):
             generate_amidakuji_data(
                 vertical_lines=5, min_horizontal_bars=10, max_horizontal_bars=5
             )
 
     def test_negative_horizontal_bars(self) -> None:
         """Test error handling for negative horizontal bars"""
-        with pytest.raises(
-            ValueError,
-            match="Minimum number of horizontal bars must be 0 or greater",
-        ):
+        with pytest.raises(ValueError, match=ERR_NEGATIVE_MIN):
             generate_amidakuji_data(
                 vertical_lines=5, min_horizontal_bars=-1, max_horizontal_bars=5
             )
@@ -79,41 +154,97 @@ class TestGenerateAmidakujiData:
 
         assert result["vertical_lines"] == 3
         assert result["horizontal_bars_total"] == 0
+        assert result["max_y_level"] == 0
         assert len(result["horizontal_bars"]) == 0
 
 
-class TestRenderToPdf:
-    """Test class for render_to_pdf function"""
+class TestSimulateAmidakuji:
+    """Test class for _simulate_amidakuji function"""
+
+    def test_bars_applied_top_to_bottom(self) -> None:
+        """Test that bars are applied in y_level order regardless of list order"""
+        amidakuji_data = {
+            "vertical_lines": 3,
+            "horizontal_bars_total": 2,
+            "horizontal_bars": [
+                {"y_level": 1, "left_line_index": 1},
+                {"y_level": 0, "left_line_index": 0},
+            ],
+        }
 
-    def test_pdf_generation(self) -> None:
-        """Test PDF file generation"""
-        # Generate test Amidakuji data
+        assert _simulate_amidakuji(amidakuji_data) == [1, 2, 0]
+
+    def test_out_of_range_bar_is_ignored(self) -> None:
+        """Test that a bar past the last vertical line does not swap anything"""
+        amidakuji_data = {
+            "vertical_lines": 3,
+            "horizontal_bars_total": 2,
+            "horizontal_bars": [
+                {"y_level": 0, "left_line_index": 2},
+                {"y_level": 1, "left_line_index": 0},
+            ],
+        }
+
+        assert _simulate_amidakuji(amidakuji_data) == [1, 0, 2]
+
+    def test_result_is_permutation(self) -> None:
+        """Test that every start point reaches a distinct end point"""
         amidakuji_data = generate_amidakuji_data(
-            vertical_lines=4, min_horizontal_bars=2, max_horizontal_bars=5
+            vertical_lines=7, min_horizontal_bars=20, max_horizontal_bars=40
         )
 
-        # Use temporary file to test PDF generation
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-            output_path = tmp_file.name
+        assert sorted(_simulate_amidakuji(amidakuji_data)) == list(range(7))
 
-        try:
-            # Generate PDF (verify no exceptions occur)
-            render_to_pdf(amidakuji_data, output_path)
 
-            # Verify that file was created
-            assert Path(output_path).exists()
-            assert Path(output_path).stat().st_size > 0
+@pytest.fixture(scope="module")
+def amidakuji_data() -> Dict[str, Any]:
+    """Small Amidakuji shared by the rendering tests"""
+    return generate_amidakuji_data(
+        vertical_lines=4, min_horizontal_bars=2, max_horizontal_bars=5
+    )
 
-        finally:
-            # Delete file after test
-            Path(output_path).unlink(missing_ok=True)
 
-    def test_output_directory_creation(self) -> None:
-        """Test case when output directory doesn't exist"""
-        amidakuji_data = generate_amidakuji_data(
-            vertical_lines=3, min_horizontal_bars=1, max_horizontal_bars=3
+@pytest.fixture(scope="module")
+def rendered_pdf_bytes(amidakuji_data: Dict[str, Any]) -> bytes:
+    """PDF rendered once in memory from the shared Amidakuji"""
+    buffer = io.BytesIO()
+    render_to_pdf(amidakuji_data, buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.slow
+class TestRenderToPdf:
+    """Test class for render_to_pdf function"""
+
+    def test_pdf_generation(self, rendered_pdf_bytes: bytes) -> None:
+        """Test PDF generation into a file-like object"""
+        assert rendered_pdf_bytes.startswith(b"%PDF")
+        assert b"/Count 1" in rendered_pdf_bytes
+
+    @pytest.mark.parametrize(
+        ("vertical_lines", "min_horizontal_bars", "max_horizontal_bars"),
+        [(2, 0, 0), (3, 1, 3), (10, 5, 20), (26, 60, 80)],
+    )
+    def test_pdf_generation_shapes(
+        self,
+        vertical_lines: int,
+        min_horizontal_bars: int,
+        max_horizontal_bars: int,
+    ) -> None:
+        """Test PDF generation across Amidakuji shapes"""
+        data = generate_amidakuji_data(
+            vertical_lines=vertical_lines,
+            min_horizontal_bars=min_horizontal_bars,
+            max_horizontal_bars=max_horizontal_bars,
         )
 
+        buffer = io.BytesIO()
+        render_to_pdf(data, buffer)
+
+        assert buffer.getvalue().startswith(b"%PDF")
+
+    def test_output_directory_creation(self, amidakuji_data: Dict[str, Any]) -> None:
+        """Test case when output directory doesn't exist"""
         with tempfile.TemporaryDirectory() as temp_dir:
             output_path = Path(temp_dir) / "subdir" / "test.pdf"
 
@@ -123,3 +254,29 @@ class TestRenderToPdf:
             # Verify that file was created
             assert output_path.exists()
             assert output_path.stat().st_size > 0
+
+
+class TestRenderPagesToPdf:
+    """Test class for render_pages_to_pdf function"""
+
+    @pytest.mark.slow
+    def test_one_page_per_amidakuji(self) -> None:
+        """Test that each Amidakuji is rendered on its own page"""
+        amidakuji_data_list = [
+            generate_amidakuji_data(
+                vertical_lines=4, min_horizontal_bars=2, max_horizontal_bars=5
+            )
+            for _ in range(3)
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "pages.pdf"
+
+            render_pages_to_pdf(amidakuji_data_list, str(output_path))
+
+            assert b"/Count 3" in output_path.read_bytes()
+
+    def test_empty_list(self) -> None:
+        """Test error handling when no Amidakuji data is given"""
+        with pytest.raises(ValueError, match=ERR_NO_PAGES):
+            render_pages_to_pdf([], "unused.pdf")